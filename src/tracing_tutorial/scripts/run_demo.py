@@ -1,31 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import sys
 
-from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import AIMessage
 
 from tracing_tutorial.supervisor_demo import build_app
 
+# Built once; each call hands out a cheap unvalidated copy because add_messages
+# assigns an id in place, and a shared instance would collapse parallel replies
+_FALLBACK_JOKE = AIMessage(content=(
+    "Here's a light coding joke (fallback): Why do programmers prefer dark mode? "
+    "Because light attracts bugs."
+))
+
 
 class _FallbackModel:
     def __init__(self, model: str = "stub-model") -> None:
         self.model = model
 
     def invoke(self, messages):
-        return AIMessage(content=(
-            "Here's a light coding joke (fallback): Why do programmers prefer dark mode? "
-            "Because light attracts bugs."
-        ))
+        return _FALLBACK_JOKE.model_copy()
 
+    async def ainvoke(self, messages):
+        return _FALLBACK_JOKE.model_copy()
 
-def main() -> None:
-    # Load environment variables from .env file
-    load_dotenv()
-    
+
+async def _amain() -> None:
     # Import and initialize tracing BEFORE creating the model
     # This ensures the model creation is also instrumented
+    # (importing the backends module also loads the .env file, once)
     from tracing_tutorial.tracing.backends import configure_tracing
     configure_tracing(os.getenv("OTEL_SERVICE_NAME", "tracing-tutorial"))
     
@@ -39,7 +45,7 @@ def main() -> None:
 
     app = build_app(model)
 
-    result = app.invoke(
+    result = await app.ainvoke(
         {
             "messages": [
                 {
@@ -50,11 +56,15 @@ def main() -> None:
         }
     )
 
+    # Render every message first, then write them out in a single call
+    out = []
     for m in result["messages"]:
-        try:
-            m.pretty_print()
-        except Exception:
-            print(m)
+        out.append(getattr(m, "pretty_repr", lambda: str(m))())
+    sys.stdout.write("\n\n".join(out) + "\n")
+
+
+def main() -> None:
+    asyncio.run(_amain())
 
 
 if __name__ == "__main__":
@@ -1,25 +1,35 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Annotated, List
+
+from typing_extensions import TypedDict
 
 from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import create_react_agent
 from langgraph.func import entrypoint, task
-from langgraph.graph import add_messages
-from langgraph_supervisor import create_supervisor
+from langgraph.graph import END, START, StateGraph, add_messages
+from langgraph.types import Command, Send
+
+
+class TeamState(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+# Prompt prefix for the joke agent, shared across calls
+_JOKE_SYSTEM = ({"role": "system", "content": "Write a short coding joke"},)
 
 
 def build_app(model: ChatOpenAI):
+    """Compile the team graph; run it with `ainvoke` since joke_agent is async."""
     # Functional API - Agent 1 (Joke Generator)
     @task
-    def generate_joke(messages: List[dict]):
-        system_message = {"role": "system", "content": "Write a short coding joke"}
-        msg = model.invoke([system_message] + messages)
+    async def generate_joke(messages: List[dict]):
+        msg = await model.ainvoke((*_JOKE_SYSTEM, *messages))
         return msg
 
     @entrypoint()
-    def joke_agent(state: dict):
-        joke = generate_joke(state["messages"]).result()
+    async def joke_agent(state: dict):
+        joke = await generate_joke(state["messages"])
         messages = add_messages(state["messages"], [joke])
         return {"messages": messages}
 
@@ -44,14 +54,25 @@ def build_app(model: ChatOpenAI):
         prompt="You are a world class researcher with access to web search. Do not do any math.",
     )
 
-    workflow = create_supervisor(
-        [research_agent, joke_agent],
-        model=model,
-        prompt=(
-            "You are a team supervisor managing a research expert and a joke expert. "
-            "For current events, use research_agent. "
-            "For any jokes, use joke_agent."
-        ),
-    )
+    # Supervisor - fan the request out to both agents in parallel, then join
+    def fan_out(state: TeamState):
+        return Command(goto=[
+            Send("research_expert", {"messages": state["messages"]}),
+            Send("joke_agent", {"messages": state["messages"]}),
+        ])
+
+    def join(state: TeamState):
+        # Agent replies have already been merged into `messages` by add_messages
+        return {"messages": []}
+
+    workflow = StateGraph(TeamState)
+    workflow.add_node("fan_out", fan_out, destinations=("research_expert", "joke_agent"))
+    workflow.add_node("research_expert", research_agent)
+    workflow.add_node("joke_agent", joke_agent)
+    workflow.add_node("join", join)
+    workflow.add_edge(START, "fan_out")
+    workflow.add_edge("research_expert", "join")
+    workflow.add_edge("joke_agent", "join")
+    workflow.add_edge("join", END)
 
     return workflow.compile()
@@ -14,153 +14,465 @@ All providers except console use OTLP protocol with provider-specific configurat
 from __future__ import annotations
 
 import base64
+import functools
+import importlib.util
+import itertools
+import logging
 import os
-from typing import Optional, Dict
+import types
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Optional, Tuple, TypeVar
+from urllib.parse import urlparse, urlunparse
 
 from dotenv import load_dotenv
 from opentelemetry import trace
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import (
-    BatchSpanProcessor,
-    ConsoleSpanExporter,
-)
 
-# Load environment variables
-load_dotenv()
+if TYPE_CHECKING:
+    # The SDK is imported lazily so importing this module stays cheap
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        SpanExporter,
+        SpanExportResult,
+    )
 
-DEFAULT_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "tracing-tutorial")
+_LOG = logging.getLogger("tracing_tutorial.backends")
+
+T = TypeVar("T")
+
+
+# Load environment variables once per process; the flag lives in the module
+# globals, so it survives importlib.reload()
+if not globals().get("_DOTENV_LOADED"):
+    load_dotenv()
+    _DOTENV_LOADED = True
+
+DEFAULT_SERVICE_NAME = "tracing-tutorial"
+
+# Every environment setting the backends read, with its default
+_SETTINGS: Dict[str, Optional[str]] = {
+    "OTEL_SERVICE_NAME": DEFAULT_SERVICE_NAME,
+    "TRACING_BACKEND": "console",
+    "OTEL_SERVICE_VERSION": "0.1.0",
+    "OTEL_ENVIRONMENT": "dev",
+    "OTEL_BSP_MAX_QUEUE_SIZE": "4096",
+    "OTEL_BSP_SCHEDULE_DELAY": "1000",
+    "OTEL_BSP_MAX_EXPORT_BATCH_SIZE": "256",
+    "OTEL_BSP_EXPORT_TIMEOUT": "10000",
+    "OTEL_EXPORTER_OTLP_TRACES_ENDPOINT": None,
+    "OTEL_EXPORTER_OTLP_ENDPOINT": None,
+    "OTEL_EXPORTER_OTLP_HEADERS": "",
+    "OTEL_EXPORTER_OTLP_TRACES_PROTOCOL": None,
+    "OTEL_EXPORTER_OTLP_PROTOCOL": None,
+    "OTEL_EXPORTER_OTLP_TRACES_COMPRESSION": None,
+    "OTEL_EXPORTER_OTLP_COMPRESSION": None,
+    "OTEL_EXPORTER_OTLP_POOL_SIZE": "1",
+    "LANGFUSE_HOST": "http://localhost:3000",
+    "LANGFUSE_PUBLIC_KEY": None,
+    "LANGFUSE_SECRET_KEY": None,
+    "LANGSMITH_ENDPOINT": "https://api.smith.langchain.com",
+    "LANGSMITH_API_KEY": None,
+    "LANGSMITH_PROJECT": None,
+    "PHOENIX_ENDPOINT": "http://localhost:6006",
+    "PHOENIX_API_KEY": None,
+    "DISABLE_LANGCHAIN_INSTRUMENTATION": None,
+}
+
+
+def _read_config() -> Mapping[str, Optional[str]]:
+    """Snapshot every backend setting from the environment into a read-only mapping."""
+    return types.MappingProxyType(
+        {key: os.getenv(key, default) for key, default in _SETTINGS.items()}
+    )
+
+
+# Backend settings; re-read by the first configure_tracing() call, so variables
+# set after import (e.g. in a notebook) still apply
+_CFG = _read_config()
+
+
+# Tracers handed out by configure_tracing, keyed by service name. Kept across
+# importlib.reload() like _DOTENV_LOADED, since the global provider survives it
+_CONFIGURED: Dict[str, trace.Tracer] = globals().get("_CONFIGURED", {})
 
 
 def _ensure_provider(service_name: str) -> TracerProvider:
-    """Initialize and set the global TracerProvider with resource attributes."""
+    """Initialize and set the global TracerProvider with resource attributes.
+
+    An SDK TracerProvider that is already registered globally is reused, since
+    OpenTelemetry only allows setting the global provider once.
+    """
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+
+    current = trace.get_tracer_provider()
+    if isinstance(current, TracerProvider):
+        return current
+
     resource = Resource.create({
         "service.name": service_name,
-        "service.version": os.getenv("OTEL_SERVICE_VERSION", "0.1.0"),
-        "deployment.environment": os.getenv("OTEL_ENVIRONMENT", "dev"),
+        "service.version": _CFG["OTEL_SERVICE_VERSION"],
+        "deployment.environment": _CFG["OTEL_ENVIRONMENT"],
     })
     provider = TracerProvider(resource=resource)
     trace.set_tracer_provider(provider)
     return provider
 
 
-def _get_otlp_exporter(endpoint: str, headers: Optional[Dict[str, str]] = None):
-    """Create OTLP exporter with appropriate protocol based on endpoint."""
-    # Determine if we should use HTTP or gRPC based on endpoint
-    if endpoint.startswith("http://") or endpoint.startswith("https://"):
-        # Use HTTP exporter for HTTP(S) endpoints
+def _make_bsp(exporter) -> BatchSpanProcessor:
+    """Create a BatchSpanProcessor tuned for bursty multi-agent workloads.
+
+    A single supervisor turn fans out many LLM/tool spans, so we use a larger
+    queue, smaller batches and shorter delays than the SDK defaults. Each value
+    can still be overridden via the standard OTEL_BSP_* environment variables.
+    """
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    return BatchSpanProcessor(
+        exporter,
+        max_queue_size=_bsp_setting("OTEL_BSP_MAX_QUEUE_SIZE", int),
+        schedule_delay_millis=_bsp_setting("OTEL_BSP_SCHEDULE_DELAY", float),
+        max_export_batch_size=_bsp_setting("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", int),
+        export_timeout_millis=_bsp_setting("OTEL_BSP_EXPORT_TIMEOUT", float),
+    )
+
+
+def _bsp_setting(key: str, cast: Callable[[str], T]) -> T:
+    """Parse an OTEL_BSP_* setting, falling back to the tuned default if invalid."""
+    try:
+        return cast(_CFG[key])
+    except ValueError:
+        _LOG.warning("Invalid value %r for %s; using %s", _CFG[key], key, _SETTINGS[key])
+        return cast(_SETTINGS[key])
+
+
+class _PooledOTLPSpanExporter:
+    """Round-robin span batches across several gRPC OTLP exporters.
+
+    Each exporter owns its own channel, so concurrent export() callers are spread
+    over multiple HTTP/2 connections. BatchSpanProcessor exports one batch at a
+    time from a single worker, so the pool is opt-in (OTEL_EXPORTER_OTLP_POOL_SIZE,
+    default 1). Implements the SpanExporter interface structurally to avoid
+    importing the SDK eagerly.
+    """
+
+    def __init__(self, exporters: List[SpanExporter]) -> None:
+        self._exporters = exporters
+        # next() on itertools.count is atomic under the GIL
+        self._counter = itertools.count()
+
+    def export(self, spans) -> SpanExportResult:
+        exporter = self._exporters[next(self._counter) % len(self._exporters)]
+        return exporter.export(spans)
+
+    def shutdown(self, timeout_millis: float = 30000) -> None:
+        # Split the caller's budget so the whole pool finishes within it
+        per_exporter = timeout_millis / len(self._exporters)
+        for exporter in self._exporters:
+            exporter.shutdown(timeout_millis=per_exporter)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        # Flush every exporter before reducing, so one failure doesn't skip the rest
+        results = [exporter.force_flush(timeout_millis) for exporter in self._exporters]
+        return all(results)
+
+
+_OTLP_PROTOCOLS = ("grpc", "http/protobuf")
+
+
+def _env_protocol() -> Optional[str]:
+    """Return the OTLP protocol requested via the environment, if any.
+
+    OTEL_EXPORTER_OTLP_TRACES_PROTOCOL takes precedence over
+    OTEL_EXPORTER_OTLP_PROTOCOL, as in the OTel spec.
+    """
+    protocol = (
+        _CFG["OTEL_EXPORTER_OTLP_TRACES_PROTOCOL"]
+        or _CFG["OTEL_EXPORTER_OTLP_PROTOCOL"]
+        or ""
+    ).lower()
+    if protocol and protocol not in _OTLP_PROTOCOLS:
+        raise ValueError(
+            f"Unsupported OTLP protocol {protocol!r}; expected one of {_OTLP_PROTOCOLS}"
+        )
+    return protocol or None
+
+
+def _resolve_protocol(endpoint: str, protocol: Optional[str] = None) -> str:
+    """Pick the OTLP protocol ("grpc" or "http/protobuf") for an endpoint.
+
+    A protocol pinned by the backend (HTTP-only services) always wins, then the
+    protocol requested via the environment. Without either, endpoints lacking a
+    URL scheme or a path (e.g. `localhost:4317`, `http://collector:4317`) use gRPC.
+    """
+    protocol = protocol or _env_protocol()
+    if protocol:
+        return protocol
+
+    _, scheme_sep, rest = endpoint.partition("://")
+    has_path = bool(rest.partition("/")[2].strip("/"))
+    return "http/protobuf" if scheme_sep and has_path else "grpc"
+
+
+# Python's OTLP exporters support these (no snappy)
+_OTLP_COMPRESSIONS = ("gzip", "deflate", "none")
+
+
+def _resolve_compression() -> str:
+    """Pick the OTLP compression; LLM spans carry large prompts, so gzip by default."""
+    compression = (
+        _CFG["OTEL_EXPORTER_OTLP_TRACES_COMPRESSION"]
+        or _CFG["OTEL_EXPORTER_OTLP_COMPRESSION"]
+        or "gzip"
+    ).lower()
+    if compression not in _OTLP_COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported OTLP compression {compression!r}; expected one of {_OTLP_COMPRESSIONS}"
+        )
+    return compression
+
+
+def _get_otlp_exporter(
+    endpoint: str,
+    headers: Optional[Dict[str, str]] = None,
+    protocol: Optional[str] = None,
+):
+    """Create OTLP exporter, preferring gRPC unless HTTP is required or requested."""
+    compression = _resolve_compression()
+
+    if _resolve_protocol(endpoint, protocol) == "http/protobuf":
+        from opentelemetry.exporter.otlp.proto.http import Compression
         from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-        
+
         # Ensure endpoint has /v1/traces for HTTP protocol
         if not endpoint.endswith("/v1/traces"):
             endpoint = f"{endpoint}/v1/traces"
-        
-        return OTLPSpanExporter(endpoint=endpoint, headers=headers)
-    else:
-        # Use gRPC exporter for non-HTTP endpoints
-        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-        
-        return OTLPSpanExporter(endpoint=endpoint, headers=headers)
 
+        return OTLPSpanExporter(
+            endpoint=endpoint, headers=headers, compression=Compression(compression)
+        )
+
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+        Compression,
+        OTLPSpanExporter,
+    )
+
+    grpc_compression = {
+        "gzip": Compression.Gzip,
+        "deflate": Compression.Deflate,
+        "none": Compression.NoCompression,
+    }[compression]
+
+    # gRPC expects host:port; the scheme only tells us whether to use TLS
+    insecure = None
+    scheme, scheme_sep, rest = endpoint.partition("://")
+    if scheme_sep:
+        insecure = scheme == "http"
+        endpoint = rest
+
+    # 4318 is the OTLP/HTTP port; older configs relied on http:// meaning HTTP
+    if urlparse(f"//{endpoint}").port == 4318:
+        _LOG.warning(
+            "Using the gRPC OTLP exporter for %s, but port 4318 usually serves OTLP/HTTP; "
+            "set OTEL_EXPORTER_OTLP_PROTOCOL=http/protobuf to export over HTTP",
+            endpoint,
+        )
+
+    # Opt-in: spread exports over several channels when they are issued concurrently
+    pool_size = int(_CFG["OTEL_EXPORTER_OTLP_POOL_SIZE"])
+    if pool_size > 1:
+        return _PooledOTLPSpanExporter([
+            OTLPSpanExporter(
+                endpoint=endpoint,
+                headers=headers,
+                insecure=insecure,
+                compression=grpc_compression,
+            )
+            for _ in range(pool_size)
+        ])
 
-def _setup_langfuse_otlp(provider: TracerProvider) -> None:
-    """Configure OTLP export to LangFuse."""
+    return OTLPSpanExporter(
+        endpoint=endpoint, headers=headers, insecure=insecure, compression=grpc_compression
+    )
+
+
+# OTLP target of a backend: (endpoint, headers, pinned protocol or None)
+_Target = Tuple[str, Dict[str, str], Optional[str]]
+
+
+@functools.lru_cache(maxsize=4)
+def _basic_auth(public_key: str, secret_key: str) -> str:
+    """Build a Basic Auth header value (LangFuse keys are ASCII)."""
+    credentials = f"{public_key}:{secret_key}".encode("ascii")
+    return "Basic " + base64.b64encode(credentials).decode("ascii")
+
+
+def _langfuse_otlp() -> _Target:
+    """Resolve the LangFuse OTLP endpoint and headers."""
     # LangFuse endpoints
-    host = os.getenv("LANGFUSE_HOST", "http://localhost:3000")
+    u = urlparse(_CFG["LANGFUSE_HOST"])
+    hostname = u.hostname or ""
     
     # Determine endpoint based on host
-    if "cloud.langfuse.com" in host:
-        # Cloud endpoints
-        if "us.cloud" in host:
-            endpoint = "https://us.cloud.langfuse.com/api/public/otel"
-        else:
-            endpoint = "https://cloud.langfuse.com/api/public/otel"
+    if hostname == "cloud.langfuse.com" or hostname.endswith(".cloud.langfuse.com"):
+        # Cloud endpoints (EU default, or a regional host such as us.cloud)
+        endpoint = f"https://{hostname}/api/public/otel"
     else:
-        # Local or custom deployment
-        endpoint = f"{host}/api/public/otel"
+        # Local or custom deployment, possibly served under a path prefix
+        path = u.path.rstrip("/") + "/api/public/otel"
+        endpoint = urlunparse((u.scheme, u.netloc, path, "", "", ""))
     
     # LangFuse requires Basic Auth with public and secret keys
-    public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
-    secret_key = os.getenv("LANGFUSE_SECRET_KEY")
+    public_key = _CFG["LANGFUSE_PUBLIC_KEY"]
+    secret_key = _CFG["LANGFUSE_SECRET_KEY"]
     
     headers = {}
     if public_key and secret_key:
-        # Create Basic Auth header
-        credentials = f"{public_key}:{secret_key}"
-        encoded = base64.b64encode(credentials.encode()).decode()
-        headers["Authorization"] = f"Basic {encoded}"
+        headers["Authorization"] = _basic_auth(public_key, secret_key)
     
-    exporter = _get_otlp_exporter(endpoint, headers)
-    provider.add_span_processor(BatchSpanProcessor(exporter))
+    # LangFuse only accepts OTLP over HTTP
+    return endpoint, headers, "http/protobuf"
 
 
-def _setup_langsmith_otlp(provider: TracerProvider) -> None:
-    """Configure OTLP export to LangSmith."""
-    # LangSmith endpoints
-    api_url = os.getenv("LANGSMITH_ENDPOINT", "https://api.smith.langchain.com")
+def _langsmith_otlp() -> _Target:
+    """Resolve the LangSmith OTLP endpoint and headers."""
+    # LangSmith endpoints (US by default, or e.g. https://eu.api.smith.langchain.com)
+    u = urlparse(_CFG["LANGSMITH_ENDPOINT"])
     
     # Determine OTLP endpoint
-    if "eu.api" in api_url:
-        endpoint = "https://eu.api.smith.langchain.com/otel"
-    else:
-        endpoint = f"{api_url}/otel" if not api_url.endswith("/otel") else api_url
+    path = u.path.rstrip("/")
+    if not path.endswith("/otel"):
+        path += "/otel"
+    endpoint = urlunparse((u.scheme, u.netloc, path, "", "", ""))
     
     # LangSmith requires API key in headers
-    api_key = os.getenv("LANGSMITH_API_KEY")
+    api_key = _CFG["LANGSMITH_API_KEY"]
     headers = {}
     
     if api_key:
         headers["x-api-key"] = api_key
     
     # Optional project name
-    project = os.getenv("LANGSMITH_PROJECT")
+    project = _CFG["LANGSMITH_PROJECT"]
     if project:
         headers["Langsmith-Project"] = project
     
-    exporter = _get_otlp_exporter(endpoint, headers)
-    provider.add_span_processor(BatchSpanProcessor(exporter))
+    # LangSmith only accepts OTLP over HTTP
+    return endpoint, headers, "http/protobuf"
 
 
-def _setup_phoenix_otlp(provider: TracerProvider) -> None:
-    """Configure OTLP export to Arize Phoenix."""
+def _phoenix_otlp() -> _Target:
+    """Resolve the Arize Phoenix OTLP endpoint and headers."""
     # Phoenix can run locally or in cloud
-    endpoint = os.getenv("PHOENIX_ENDPOINT", "http://localhost:6006")
+    endpoint = _CFG["PHOENIX_ENDPOINT"]
     
     # Phoenix Cloud requires API key
-    api_key = os.getenv("PHOENIX_API_KEY")
+    api_key = _CFG["PHOENIX_API_KEY"]
     headers = {}
     
     if api_key:
         headers["authorization"] = api_key
     
-    exporter = _get_otlp_exporter(endpoint, headers)
-    provider.add_span_processor(BatchSpanProcessor(exporter))
+    # Phoenix serves OTLP/HTTP on its UI port (6006); gRPC lives on 4317
+    return endpoint, headers, "http/protobuf"
 
 
-def _setup_generic_otlp(provider: TracerProvider) -> None:
-    """Configure generic OTLP export for custom collectors."""
-    # Support both environment variable formats
-    endpoint = os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT") or \
-               os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "localhost:4317")
+def _parse_header(header: str) -> Tuple[str, str]:
+    """Split one "key=value" entry; a missing "=" leaves the value empty."""
+    key, _, value = header.partition("=")
+    return key.strip(), value.strip()
+
+
+def _generic_otlp() -> _Target:
+    """Resolve the endpoint and headers for a generic OTLP collector."""
+    # Supports both OTEL_EXPORTER_OTLP_TRACES_ENDPOINT and OTEL_EXPORTER_OTLP_ENDPOINT;
+    # defaults to a local collector on the spec's port for the chosen protocol
+    endpoint = _CFG["OTEL_EXPORTER_OTLP_TRACES_ENDPOINT"] or _CFG["OTEL_EXPORTER_OTLP_ENDPOINT"]
+    if not endpoint:
+        if _env_protocol() == "http/protobuf":
+            endpoint = "http://localhost:4318"
+        else:
+            # The http:// scheme keeps the local gRPC channel plaintext
+            endpoint = "http://localhost:4317"
     
     # Support custom headers for authentication
-    headers_str = os.getenv("OTEL_EXPORTER_OTLP_HEADERS", "")
-    headers = {}
+    # Parse headers in format: "key1=value1,key2=value2"; entries without "=" or
+    # with a blank name/value are dropped
+    headers_str = _CFG["OTEL_EXPORTER_OTLP_HEADERS"]
+    headers = {k: v for k, v in map(_parse_header, headers_str.split(",")) if k and v}
     
-    if headers_str:
-        # Parse headers in format: "key1=value1,key2=value2"
-        for header in headers_str.split(","):
-            if "=" in header:
-                key, value = header.split("=", 1)
-                headers[key.strip()] = value.strip()
-    
-    exporter = _get_otlp_exporter(endpoint, headers)
-    provider.add_span_processor(BatchSpanProcessor(exporter))
+    return endpoint, headers, None
+
+
+# OTLP backends selectable via TRACING_BACKEND
+_BACKENDS: Dict[str, Callable[[], _Target]] = {
+    "langfuse": _langfuse_otlp,
+    "langsmith": _langsmith_otlp,
+    "phoenix": _phoenix_otlp,
+    "otlp": _generic_otlp,
+}
 
 
 def _setup_console(provider: TracerProvider) -> None:
     """Configure console export for debugging."""
-    provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    provider.add_span_processor(_make_bsp(ConsoleSpanExporter()))
+
+
+_LANGCHAIN_INSTRUMENTATION = "openinference.instrumentation.langchain"
+
+
+def _module_available(name: str) -> bool:
+    """Check that a dotted module can be imported, without importing it."""
+    # find_spec() imports parent packages and raises if one is missing, so walk
+    # the dotted path one level at a time
+    parts = name.split(".")
+    return all(
+        importlib.util.find_spec(".".join(parts[:i])) is not None
+        for i in range(1, len(parts) + 1)
+    )
+
+
+def _setup_backend(provider: TracerProvider) -> None:
+    """Attach the exporter selected by TRACING_BACKEND to the provider."""
+    backend = _CFG["TRACING_BACKEND"].lower()
+
+    if backend == "console":
+        _setup_console(provider)
+    else:
+        # Unknown backends default to generic OTLP
+        endpoint, headers, protocol = _BACKENDS.get(backend, _generic_otlp)()
+        exporter = _get_otlp_exporter(endpoint, headers, protocol)
+        provider.add_span_processor(_make_bsp(exporter))
+
+
+def _instrument_langchain(provider: TracerProvider) -> None:
+    """Instrument LangChain for automatic tracing.
+
+    Opt out with DISABLE_LANGCHAIN_INSTRUMENTATION=1.
+    """
+    if _CFG["DISABLE_LANGCHAIN_INSTRUMENTATION"] == "1":
+        return
+
+    if not _module_available(_LANGCHAIN_INSTRUMENTATION):
+        _LOG.warning("LangChain instrumentation not available: %s", _LANGCHAIN_INSTRUMENTATION)
+        return
+
+    try:
+        from openinference.instrumentation.langchain import LangChainInstrumentor
+    except ImportError as e:
+        # The package is installed but broken (e.g. a missing transitive dependency)
+        _LOG.warning("LangChain instrumentation not available: %s", e)
+        return
+
+    try:
+        # Pass skip_dep_check=True to avoid dependency check issues
+        LangChainInstrumentor().instrument(
+            tracer_provider=provider,
+            skip_dep_check=True
+        )
+    except Exception as e:
+        _LOG.warning("Failed to instrument LangChain: %s", e)
 
 
 def configure_tracing(service_name: Optional[str] = None) -> trace.Tracer:
@@ -168,6 +480,10 @@ def configure_tracing(service_name: Optional[str] = None) -> trace.Tracer:
     Configure OpenTelemetry tracing with the specified backend.
     
     All backends except 'console' use OTLP protocol with provider-specific configuration.
+    Safe to call repeatedly: the backend and LangChain instrumentation are set up on
+    the first call only, and tracers are cached by name. All tracers share the one
+    global provider, so spans keep the `service.name` of the first configuration;
+    a warning is logged when a different service name is requested.
     
     Args:
         service_name: Optional service name override
@@ -175,35 +491,31 @@ def configure_tracing(service_name: Optional[str] = None) -> trace.Tracer:
     Returns:
         Configured OpenTelemetry tracer
     """
-    backend = os.getenv("TRACING_BACKEND", "console").lower()
-    service = service_name or DEFAULT_SERVICE_NAME
-    
+    global _CFG
+    if not _CONFIGURED:
+        # Take the settings as they are now, not as they were at import
+        _CFG = _read_config()
+
+    service = service_name or _CFG["OTEL_SERVICE_NAME"]
+    if service in _CONFIGURED:
+        return _CONFIGURED[service]
+
     provider = _ensure_provider(service)
-    
-    # Configure the appropriate backend
-    if backend == "langfuse":
-        _setup_langfuse_otlp(provider)
-    elif backend == "langsmith":
-        _setup_langsmith_otlp(provider)
-    elif backend == "phoenix":
-        _setup_phoenix_otlp(provider)
-    elif backend == "console":
-        _setup_console(provider)
-    else:
-        # Default to generic OTLP
-        _setup_generic_otlp(provider)
-    
-    # Instrument LangChain for automatic tracing
-    try:
-        from openinference.instrumentation.langchain import LangChainInstrumentor
-        # Pass skip_dep_check=True to avoid dependency check issues
-        LangChainInstrumentor().instrument(
-            tracer_provider=provider,
-            skip_dep_check=True
+    configured_service = provider.resource.attributes.get("service.name")
+    if configured_service != service:
+        _LOG.warning(
+            "Tracing is already configured for service %r; spans from %r will be "
+            "reported under that service name",
+            configured_service,
+            service,
         )
-    except ImportError as e:
-        print(f"Warning: LangChain instrumentation not available: {e}")
-    except Exception as e:
-        print(f"Warning: Failed to instrument LangChain: {e}")
-    
-    return trace.get_tracer(service)
\ No newline at end of file
+
+    # Exporters and LangChain instrumentation hang off the shared global provider,
+    # so attach them only once; repeating this would duplicate every span
+    if not _CONFIGURED:
+        _setup_backend(provider)
+        _instrument_langchain(provider)
+
+    tracer = trace.get_tracer(service)
+    _CONFIGURED[service] = tracer
+    return tracer
@@ -0,0 +1,307 @@
+import importlib
+import logging
+import sys
+
+import pytest
+from opentelemetry import trace
+
+from tracing_tutorial.tracing import backends
+
+
+@pytest.fixture
+def set_env(monkeypatch):
+    """Replace the backend environment with exactly the given variables."""
+
+    def _set(**env):
+        for key in backends._SETTINGS:
+            monkeypatch.delenv(key, raising=False)
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        monkeypatch.setattr(backends, "_CFG", backends._read_config())
+
+    return _set
+
+
+@pytest.mark.parametrize(
+    "endpoint, expected",
+    [
+        ("localhost:4317", "grpc"),
+        ("http://host:4317", "grpc"),
+        ("https://host:4317/", "grpc"),
+        ("http://host:4318/v1/traces", "http/protobuf"),
+    ],
+)
+def test_resolve_protocol_from_endpoint(set_env, endpoint, expected):
+    set_env()
+    assert backends._resolve_protocol(endpoint) == expected
+
+
+@pytest.mark.parametrize(
+    "env, endpoint, expected",
+    [
+        ({"OTEL_EXPORTER_OTLP_PROTOCOL": "http/protobuf"}, "http://host:4318", "http/protobuf"),
+        ({"OTEL_EXPORTER_OTLP_PROTOCOL": "grpc"}, "http://host:4318/v1/traces", "grpc"),
+        ({"OTEL_EXPORTER_OTLP_PROTOCOL": "GRPC"}, "http://host:4318/v1/traces", "grpc"),
+        (
+            {
+                "OTEL_EXPORTER_OTLP_PROTOCOL": "grpc",
+                "OTEL_EXPORTER_OTLP_TRACES_PROTOCOL": "http/protobuf",
+            },
+            "http://host:4318",
+            "http/protobuf",
+        ),
+    ],
+)
+def test_resolve_protocol_env_override(set_env, env, endpoint, expected):
+    set_env(**env)
+    assert backends._resolve_protocol(endpoint) == expected
+
+
+def test_resolve_protocol_rejects_unknown_protocol(set_env):
+    set_env(OTEL_EXPORTER_OTLP_PROTOCOL="http/json")
+    with pytest.raises(ValueError, match="http/json"):
+        backends._resolve_protocol("localhost:4317")
+
+
+@pytest.mark.parametrize("backend", ["langfuse", "langsmith", "phoenix"])
+def test_http_only_backends_ignore_grpc_override(set_env, backend):
+    set_env(OTEL_EXPORTER_OTLP_PROTOCOL="grpc")
+    endpoint, _, protocol = backends._BACKENDS[backend]()
+    assert backends._resolve_protocol(endpoint, protocol) == "http/protobuf"
+
+
+@pytest.mark.parametrize(
+    "env, expected",
+    [
+        ({}, "http://localhost:4317"),
+        ({"OTEL_EXPORTER_OTLP_PROTOCOL": "http/protobuf"}, "http://localhost:4318"),
+        ({"OTEL_EXPORTER_OTLP_ENDPOINT": "collector:4317"}, "collector:4317"),
+        (
+            {
+                "OTEL_EXPORTER_OTLP_ENDPOINT": "collector:4317",
+                "OTEL_EXPORTER_OTLP_TRACES_ENDPOINT": "http://traces:4318/v1/traces",
+            },
+            "http://traces:4318/v1/traces",
+        ),
+    ],
+)
+def test_generic_default_endpoint(set_env, env, expected):
+    set_env(**env)
+    endpoint, _, _ = backends._generic_otlp()
+    assert endpoint == expected
+
+
+@pytest.mark.parametrize(
+    "host, expected",
+    [
+        ("https://cloud.langfuse.com", "https://cloud.langfuse.com/api/public/otel"),
+        ("https://eu.cloud.langfuse.com", "https://eu.cloud.langfuse.com/api/public/otel"),
+        ("https://us.cloud.langfuse.com/", "https://us.cloud.langfuse.com/api/public/otel"),
+        ("http://localhost:3000", "http://localhost:3000/api/public/otel"),
+        (
+            "https://notcloud.langfuse.com.evil",
+            "https://notcloud.langfuse.com.evil/api/public/otel",
+        ),
+        ("https://example.com/langfuse/", "https://example.com/langfuse/api/public/otel"),
+    ],
+)
+def test_langfuse_endpoint(set_env, host, expected):
+    set_env(LANGFUSE_HOST=host)
+    endpoint, _, _ = backends._langfuse_otlp()
+    assert endpoint == expected
+
+
+@pytest.mark.parametrize(
+    "api_url, expected",
+    [
+        ("https://api.smith.langchain.com", "https://api.smith.langchain.com/otel"),
+        ("https://eu.api.smith.langchain.com", "https://eu.api.smith.langchain.com/otel"),
+        ("https://eu.api.smith.langchain.com/otel", "https://eu.api.smith.langchain.com/otel"),
+        ("https://eu.api.smith.langchain.com/otel/", "https://eu.api.smith.langchain.com/otel"),
+    ],
+)
+def test_langsmith_endpoint(set_env, api_url, expected):
+    set_env(LANGSMITH_ENDPOINT=api_url)
+    endpoint, _, _ = backends._langsmith_otlp()
+    assert endpoint == expected
+
+
+@pytest.mark.parametrize(
+    "env, expected",
+    [
+        ({}, (4096, 256)),
+        ({"OTEL_BSP_MAX_QUEUE_SIZE": "100", "OTEL_BSP_MAX_EXPORT_BATCH_SIZE": "10"}, (100, 10)),
+        ({"OTEL_BSP_MAX_QUEUE_SIZE": "abc"}, (4096, 256)),
+    ],
+)
+def test_bsp_settings(set_env, env, expected):
+    set_env(**env)
+    queue_size = backends._bsp_setting("OTEL_BSP_MAX_QUEUE_SIZE", int)
+    batch_size = backends._bsp_setting("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", int)
+    assert (queue_size, batch_size) == expected
+
+
+def test_generic_default_is_plaintext_grpc(set_env):
+    set_env()
+    endpoint, headers, protocol = backends._generic_otlp()
+    exporter = backends._get_otlp_exporter(endpoint, headers, protocol)
+    assert type(exporter).__module__.endswith(".grpc.trace_exporter")
+    assert exporter._insecure is True
+
+
+class _RecordingExporter:
+    def __init__(self, flush_result=True):
+        self.exported = []
+        self.shutdown_timeouts = []
+        self.flushed = 0
+        self.flush_result = flush_result
+
+    def export(self, spans):
+        self.exported.append(spans)
+        return "ok"
+
+    def shutdown(self, timeout_millis=30000):
+        self.shutdown_timeouts.append(timeout_millis)
+
+    def force_flush(self, timeout_millis=30000):
+        self.flushed += 1
+        return self.flush_result
+
+
+def test_pool_round_robins_exports():
+    exporters = [_RecordingExporter() for _ in range(3)]
+    pool = backends._PooledOTLPSpanExporter(exporters)
+    for batch in range(5):
+        assert pool.export([batch]) == "ok"
+    assert [e.exported for e in exporters] == [[[0], [3]], [[1], [4]], [[2]]]
+
+
+def test_pool_splits_shutdown_timeout():
+    exporters = [_RecordingExporter() for _ in range(4)]
+    backends._PooledOTLPSpanExporter(exporters).shutdown(timeout_millis=1000)
+    assert [e.shutdown_timeouts for e in exporters] == [[250], [250], [250], [250]]
+
+
+def test_pool_flushes_every_exporter():
+    exporters = [_RecordingExporter(flush_result=False), _RecordingExporter()]
+    assert backends._PooledOTLPSpanExporter(exporters).force_flush() is False
+    assert [e.flushed for e in exporters] == [1, 1]
+
+
+@pytest.mark.parametrize(
+    "headers_str, expected",
+    [
+        ("", {}),
+        ("a=b, c = d ,x, =y,z= ,k=v=w", {"a": "b", "c": "d", "k": "v=w"}),
+    ],
+)
+def test_generic_headers(set_env, headers_str, expected):
+    set_env(OTEL_EXPORTER_OTLP_HEADERS=headers_str)
+    _, headers, _ = backends._generic_otlp()
+    assert headers == expected
+
+
+def test_broken_langchain_instrumentation_logs_warning(set_env, monkeypatch, caplog):
+    set_env()
+    # A None entry in sys.modules makes the import raise ImportError
+    monkeypatch.setitem(sys.modules, backends._LANGCHAIN_INSTRUMENTATION, None)
+    monkeypatch.setattr(backends, "_module_available", lambda name: True)
+    with caplog.at_level(logging.WARNING, logger="tracing_tutorial.backends"):
+        backends._instrument_langchain(provider=None)
+    assert "LangChain instrumentation not available" in caplog.text
+
+
+@pytest.fixture
+def fresh_tracing(set_env, monkeypatch):
+    """Give each test its own global TracerProvider and configure_tracing cache."""
+    from opentelemetry.util._once import Once
+
+    set_env(TRACING_BACKEND="console", DISABLE_LANGCHAIN_INSTRUMENTATION="1")
+    monkeypatch.setattr(trace, "_TRACER_PROVIDER", None)
+    monkeypatch.setattr(trace, "_TRACER_PROVIDER_SET_ONCE", Once())
+    monkeypatch.setattr(backends, "_CONFIGURED", {})
+    yield
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
+
+
+def _span_processors():
+    return trace.get_tracer_provider()._active_span_processor._span_processors
+
+
+def test_configure_tracing_is_idempotent(fresh_tracing):
+    tracer = backends.configure_tracing("svc")
+    assert backends.configure_tracing("svc") is tracer
+    assert len(_span_processors()) == 1
+
+
+def test_configure_tracing_survives_reload(fresh_tracing):
+    tracer = backends.configure_tracing("svc")
+    backends.configure_tracing("svc")
+    importlib.reload(backends)
+    assert backends.configure_tracing("svc") is tracer
+    assert len(_span_processors()) == 1
+
+
+def test_configure_tracing_warns_on_other_service(fresh_tracing, caplog):
+    backends.configure_tracing("a")
+    with caplog.at_level(logging.WARNING, logger="tracing_tutorial.backends"):
+        backends.configure_tracing("b")
+    assert "already configured for service 'a'" in caplog.text
+    assert len(_span_processors()) == 1
+
+
+@pytest.mark.parametrize(
+    "env, expected",
+    [
+        ({}, "gzip"),
+        ({"OTEL_EXPORTER_OTLP_COMPRESSION": "DEFLATE"}, "deflate"),
+        (
+            {
+                "OTEL_EXPORTER_OTLP_COMPRESSION": "deflate",
+                "OTEL_EXPORTER_OTLP_TRACES_COMPRESSION": "none",
+            },
+            "none",
+        ),
+    ],
+)
+def test_resolve_compression(set_env, env, expected):
+    set_env(**env)
+    assert backends._resolve_compression() == expected
+
+
+def test_resolve_compression_rejects_snappy(set_env):
+    set_env(OTEL_EXPORTER_OTLP_COMPRESSION="snappy")
+    with pytest.raises(ValueError, match="snappy"):
+        backends._resolve_compression()
+
+
+@pytest.mark.parametrize(
+    "endpoint, protocol",
+    [("http://localhost:4317", None), ("http://localhost:4318", "http/protobuf")],
+)
+def test_exporters_default_to_gzip(set_env, endpoint, protocol):
+    import grpc
+
+    set_env()
+    exporter = backends._get_otlp_exporter(endpoint, protocol=protocol)
+    if protocol:
+        assert exporter._compression.value == "gzip"
+    else:
+        assert exporter._compression == grpc.Compression.Gzip
+
+
+@pytest.mark.parametrize(
+    "endpoint, warned",
+    [
+        ("http://localhost:4318", True),
+        ("http://collector:4318/", True),
+        ("http://localhost:4317", False),
+    ],
+)
+def test_grpc_on_http_port_warns(set_env, caplog, endpoint, warned):
+    set_env()
+    with caplog.at_level(logging.WARNING, logger="tracing_tutorial.backends"):
+        backends._get_otlp_exporter(endpoint)
+    assert ("port 4318" in caplog.text) is warned
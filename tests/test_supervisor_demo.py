@@ -0,0 +1,47 @@
+import asyncio
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from tracing_tutorial.supervisor_demo import build_app
+
+
+class _FakeChatModel(BaseChatModel):
+    """Async chat model that numbers its replies and records call overlap."""
+
+    calls: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError("build_app is driven through ainvoke")
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        reply = f"reply {self.calls}"
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply))])
+
+
+def test_build_app_runs_agents_in_parallel_and_merges_replies():
+    model = _FakeChatModel()
+    app = build_app(model)
+
+    result = asyncio.run(app.ainvoke({"messages": [{"role": "user", "content": "hi"}]}))
+    messages = result["messages"]
+
+    assert [m.content for m in messages if isinstance(m, HumanMessage)] == ["hi"]
+    replies = sorted(m.content for m in messages if isinstance(m, AIMessage))
+    assert replies == ["reply 1", "reply 2"]
+    assert model.max_in_flight == 2